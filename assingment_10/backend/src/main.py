@@ -5,16 +5,17 @@ Designed for extensive testing and high coverage.
 from fastapi import FastAPI, HTTPException, Depends, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import OAuth2PasswordRequestForm
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from sqlalchemy.orm import Session
 import uvicorn
 
 # Import application components
 from .config import get_settings
 from .database import get_db, create_tables, User
-from .auth import get_auth_service, AuthenticationError
-from .dependencies import get_current_user, get_current_active_user
+from .auth import get_auth_service, get_token_manager, AuthenticationError
+from .dependencies import get_current_user, get_current_active_user, CurrentUser, security
 from . import schemas
+from pydantic import TypeAdapter
 
 # Initialize settings and create tables
 settings = get_settings()
@@ -26,9 +27,26 @@ app = FastAPI(
     description="A comprehensive authentication API with extensive testing coverage",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    # orjson serializes responses in native code with datetime support,
+    # a large cut over the stdlib encoder on these JSON-heavy endpoints.
+    default_response_class=ORJSONResponse
 )
 
+@app.on_event("startup")
+async def expand_threadpool():
+    """
+    Raise the AnyIO threadpool capacity for sync endpoints.
+
+    The auth endpoints run as plain def in this pool and each login or
+    register holds a worker for the duration of a bcrypt call, so the
+    default of 40 tokens caps concurrent logins well below what the
+    CPU can serve.
+    """
+    from anyio import to_thread
+    to_thread.current_default_thread_limiter().total_tokens = 64
+
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -71,7 +89,7 @@ async def health_check():
 
 # Authentication endpoints
 @app.post("/auth/register", response_model=schemas.UserResponse, status_code=status.HTTP_201_CREATED)
-async def register(
+def register(
     user_create: schemas.UserCreate,
     db: Session = Depends(get_db),
     auth_service=Depends(get_auth_service)
@@ -102,7 +120,7 @@ async def register(
 
 
 @app.post("/auth/login", response_model=schemas.Token)
-async def login(
+def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: Session = Depends(get_db),
     auth_service=Depends(get_auth_service)
@@ -152,7 +170,7 @@ async def login(
 
 
 @app.post("/auth/refresh", response_model=schemas.Token)
-async def refresh_token(
+def refresh_token(
     refresh_data: schemas.RefreshToken,
     db: Session = Depends(get_db),
     auth_service=Depends(get_auth_service)
@@ -182,15 +200,19 @@ async def refresh_token(
 
 
 @app.post("/auth/logout", response_model=schemas.MessageResponse)
-async def logout(current_user: User = Depends(get_current_user)):
+async def logout(
+    current_user: User = Depends(get_current_user),
+    credentials=Depends(security),
+    token_manager=Depends(get_token_manager)
+):
     """
     Logout user (client should discard tokens).
     
-    In a production system, you might want to:
-    - Blacklist the token
-    - Log the logout event
-    - Clear session data
+    The presented access token is revoked server-side so the verified-
+    token cache cannot serve it after logout.
     """
+    if credentials:
+        token_manager.revoke_token(credentials.credentials)
     return schemas.MessageResponse(
         message="Successfully logged out",
         success=True
@@ -198,8 +220,13 @@ async def logout(current_user: User = Depends(get_current_user)):
 
 
 # User management endpoints
-@app.get("/users/me", response_model=schemas.UserResponse)
-async def get_current_user_profile(current_user: User = Depends(get_current_active_user)):
+# Built once: validates the authenticated user into the response shape
+# and dumps it for orjson without FastAPI's extra response_model pass.
+_USER_RESPONSE_ADAPTER = TypeAdapter(schemas.UserResponse)
+
+
+@app.get("/users/me")
+async def get_current_user_profile(current_user: User = Depends(CurrentUser())):
     """
     Get current user profile.
     
@@ -208,13 +235,14 @@ async def get_current_user_profile(current_user: User = Depends(get_current_acti
     - User data retrieval
     - Privacy protection
     """
-    return current_user
+    validated = _USER_RESPONSE_ADAPTER.validate_python(current_user, from_attributes=True)
+    return ORJSONResponse(_USER_RESPONSE_ADAPTER.dump_python(validated, mode="json"))
 
 
-@app.put("/users/me", response_model=schemas.UserResponse)
-async def update_current_user_profile(
+@app.put("/users/me", response_model=schemas.UserResponse, response_model_exclude_unset=True)
+def update_current_user_profile(
     user_update: schemas.UserUpdate,
-    current_user: User = Depends(get_current_active_user),
+    current_user: User = Depends(CurrentUser()),
     db: Session = Depends(get_db),
     auth_service=Depends(get_auth_service)
 ):
@@ -244,9 +272,9 @@ async def update_current_user_profile(
 
 # Password management endpoints (Bonus feature)
 @app.post("/users/change-password", response_model=schemas.MessageResponse)
-async def change_password(
+def change_password(
     password_change: schemas.PasswordChange,
-    current_user: User = Depends(get_current_active_user),
+    current_user: User = Depends(CurrentUser()),
     db: Session = Depends(get_db),
     auth_service=Depends(get_auth_service)
 ):
@@ -4,16 +4,27 @@ Provides common test setup and utilities.
 """
 import pytest
 import os
-import tempfile
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from fastapi.testclient import TestClient
-from unittest.mock import MagicMock
-
-# Import application components
-from src.database import Base, get_db, User
+import re
+from types import MappingProxyType
+
+# Drop the bcrypt work factor before any src module is imported (the
+# hashing context is built at import time from settings). Cost 4 is the
+# library minimum: the same code paths run, ~250ms faster per hash.
+# This is deliberately the only suite-wide knob on the KDF: a blanket
+# verify_password/hash_password stub here would blind the integration
+# tests that assert real wrong-password rejection over HTTP. Unit
+# tests that want stubs install their own (see test_auth.py).
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+
+from dataclasses import dataclass
+from functools import lru_cache
+
+# Keep the module-level imports light: everything here is paid on every
+# collection pass and on every xdist worker start. SQLAlchemy, the ORM
+# models and the hashing stack are imported lazily by the fixtures that
+# actually touch them; only the (comparatively cheap) settings module is
+# needed up front for the TestSettings class definition.
 from src.config import Settings, get_settings
-from src.auth import get_auth_service, get_token_manager
 
 
 class TestSettings(Settings):
@@ -34,39 +45,117 @@ class TestSettings(Settings):
 
 @pytest.fixture(scope="session")
 def test_settings():
-    """Provide test settings."""
-    return TestSettings()
+    """
+    Provide test settings.
+
+    Built with model_construct: every value is a trusted literal from
+    the class body, so there is nothing for Pydantic to validate and no
+    reason to scan the environment or a .env file for overrides.
+    """
+    return TestSettings.model_construct()
 
 
 @pytest.fixture(scope="session")
 def test_engine(test_settings):
-    """Create test database engine."""
+    """
+    Create test database engine.
+
+    One DBAPI connection backs the whole engine: StaticPool pins a
+    single connection for the engine's lifetime (equivalent to passing
+    a `creator=` returning a shared sqlite3.Connection, without
+    bypassing SQLAlchemy's connect-event hooks below), and the
+    shared-cache URI means any second connection would still see the
+    same in-memory database. db_connection closes it at session end.
+    """
+    from sqlalchemy import create_engine, event
+    from sqlalchemy.pool import StaticPool
+    
     # Use in-memory SQLite for faster tests
+    # StaticPool hands every checkout the same underlying connection,
+    # so any code that connects through the engine (rather than the
+    # shared session-scoped connection) still sees the one in-memory
+    # database instead of a fresh empty one.
+    # The database name is keyed by the pytest-xdist worker id so that
+    # a parallel run (`pytest -n auto`) gives every worker its own
+    # in-memory database instead of colliding on one shared-cache name.
+    worker = os.environ.get("PYTEST_XDIST_WORKER", "gw0")
     engine = create_engine(
-        "sqlite:///:memory:",
+        f"sqlite:///file:testdb_{worker}?mode=memory&cache=shared&uri=true",
         connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
         echo=False
     )
+    
+    # pysqlite's default transaction handling breaks SAVEPOINTs, which
+    # the per-test rollback pattern below depends on; the documented
+    # workaround is to disable its implicit BEGIN and emit our own.
+    @event.listens_for(engine, "connect")
+    def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+        # Durability is irrelevant for a throwaway test database; skip
+        # the sync/journal bookkeeping SQLite still does even in memory.
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA synchronous=OFF")
+        cursor.execute("PRAGMA journal_mode=MEMORY")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.close()
+    
+    @event.listens_for(engine, "begin")
+    def _emit_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+    
     return engine
 
 
 @pytest.fixture(scope="session")
-def test_session_factory(test_engine):
-    """Create test session factory."""
-    Base.metadata.create_all(bind=test_engine)
-    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=test_engine)
+def db_connection(test_engine):
+    """Hold one connection for the whole session with the schema built once."""
+    from src.database import Base
+    
+    connection = test_engine.connect()
+    Base.metadata.create_all(bind=connection)
+    connection.commit()
+    yield connection
+    connection.close()
+
+
+@pytest.fixture(scope="session")
+def test_session_factory(db_connection):
+    """Create test session factory bound to the shared connection."""
+    from sqlalchemy.orm import sessionmaker
+    
+    TestingSessionLocal = sessionmaker(
+        autocommit=False,
+        autoflush=False,
+        expire_on_commit=False,
+        bind=db_connection,
+        join_transaction_mode="create_savepoint",
+    )
     return TestingSessionLocal
 
 
 @pytest.fixture
-def db_session(test_session_factory):
-    """Provide database session for tests."""
+def db_session(db_connection, test_session_factory):
+    """
+    Provide database session for tests.
+    
+    Each test runs inside an outer transaction on the shared connection;
+    commits made by the test (or by the app through the dependency
+    override) only release SAVEPOINTs, and the outer transaction is
+    rolled back afterwards so no rows leak between tests.
+    
+    The schema is created exactly once (db_connection); there is
+    deliberately no per-test DELETE/TRUNCATE sweep, since rolling back
+    the outer transaction is strictly cheaper and cannot miss a table.
+    """
+    transaction = db_connection.begin()
     session = test_session_factory()
     try:
         yield session
     finally:
-        session.rollback()
         session.close()
+        if transaction.is_active:
+            transaction.rollback()
 
 
 @pytest.fixture
@@ -88,28 +177,55 @@ def override_get_settings(test_settings):
     return _override_get_settings
 
 
-@pytest.fixture
-def app(override_get_db, override_get_settings):
-    """Create FastAPI test app with overridden dependencies."""
+# The HTTP fixtures below stay in this flat conftest rather than a
+# tests/api/ sub-package: their imports (FastAPI app, Starlette, httpx)
+# are deferred into the fixture bodies, so test modules that never
+# request `client` — test_auth.py, test_password.py — never pay for
+# them anyway, and the suite keeps its single-directory layout.
+@pytest.fixture(scope="session")
+def _app_session():
+    """Import and build the FastAPI app exactly once per session."""
     from src.main import app
     
-    # Override dependencies
-    app.dependency_overrides[get_db] = override_get_db
-    app.dependency_overrides[get_settings] = override_get_settings
+    return app
+
+
+@pytest.fixture
+def app(_app_session, override_get_db, override_get_settings):
+    """Provide the shared app with per-test dependency overrides."""
+    from src.database import get_db
+    
+    _app_session.dependency_overrides[get_db] = override_get_db
+    _app_session.dependency_overrides[get_settings] = override_get_settings
     
-    yield app
+    yield _app_session
     
     # Clean up overrides
-    app.dependency_overrides.clear()
+    _app_session.dependency_overrides.clear()
 
 
-@pytest.fixture
-def client(app):
-    """Provide test client."""
-    return TestClient(app)
+@pytest.fixture(scope="session")
+def _client_session(_app_session):
+    """
+    Build the TestClient (transport, middleware stack) once.
+
+    Entered as a context manager so ASGI lifespan startup/shutdown runs
+    exactly once per session instead of never (plain construction) or
+    once per test (function-scoped `with` blocks).
+    """
+    from fastapi.testclient import TestClient
+
+    with TestClient(_app_session) as c:
+        yield c
 
 
 @pytest.fixture
+def client(app, _client_session):
+    """Provide test client; only the dependency overrides change per test."""
+    return _client_session
+
+
+@pytest.fixture(scope="session")
 def sample_user_data():
     """Provide sample user data for testing."""
     return {
@@ -124,25 +240,53 @@ def sample_user_data():
 
 @pytest.fixture
 def sample_user(db_session, sample_user_data):
-    """Create a sample user in the database."""
-    from src.auth import auth_service
-    from src import schemas
-    
-    user_create = schemas.UserCreate(**sample_user_data)
-    user = auth_service.create_user(db_session, user_create)
-    db_session.commit()
+    """
+    Create a sample user in the database.
+
+    The row must be recreated per test (it rolls back with the outer
+    transaction), but nothing else from auth_service.create_user is
+    needed here: the duplicate-email check is moot on a fresh
+    transaction and, above all, the service re-runs the KDF on every
+    call. Building the row directly with the precomputed hash from
+    _hash_table() leaves only an INSERT per test. flush (not commit) is
+    enough — the row only needs to be visible inside the test's
+    enclosing transaction.
+    """
+    from src.database import User
+
+    user = User(
+        email=sample_user_data["email"],
+        hashed_password=_hash_table()[sample_user_data["password"]],
+        first_name=sample_user_data["first_name"],
+        last_name=sample_user_data["last_name"],
+        bio=sample_user_data["bio"],
+    )
+    db_session.add(user)
+    db_session.flush()
     return user
 
 
+_SESSION_TOKEN_PAIR = None
+
+
 @pytest.fixture
 def authenticated_user_tokens(sample_user):
-    """Provide tokens for authenticated user."""
+    """
+    Provide tokens for authenticated user.
+
+    The user row itself must be recreated per test (it rolls back with
+    the outer transaction), but the signed JWT pair depends only on the
+    user's email and id, which are identical on every recreation — so
+    the tokens are signed once and reused for the rest of the session.
+    """
     from src.auth import auth_service
-    
-    token_pair = auth_service.create_token_pair(sample_user)
+
+    global _SESSION_TOKEN_PAIR
+    if _SESSION_TOKEN_PAIR is None:
+        _SESSION_TOKEN_PAIR = auth_service.create_token_pair(sample_user)
     return {
-        "access_token": token_pair.access_token,
-        "refresh_token": token_pair.refresh_token,
+        "access_token": _SESSION_TOKEN_PAIR.access_token,
+        "refresh_token": _SESSION_TOKEN_PAIR.refresh_token,
         "user": sample_user
     }
 
@@ -155,145 +299,194 @@ def auth_headers(authenticated_user_tokens):
     }
 
 
+@dataclass
+class _FakeUser:
+    """
+    Lightweight stand-in for the User model in unit tests.
+
+    MagicMock(spec=User) walks the declarative model's full attribute
+    set (columns, descriptors, mapper machinery) on every construction;
+    a plain dataclass carries exactly the attributes the code under
+    test reads and costs nothing to build. Tests are free to mutate it.
+    """
+    id: int = 1
+    email: str = "test@example.com"
+    hashed_password: str = "$2b$12$hash"
+    first_name: str = "John"
+    last_name: str = "Doe"
+    bio: str = "Test bio"
+    is_active: bool = True
+    is_verified: bool = False
+    failed_login_attempts: int = 0
+    locked_until: object = None
+    last_login: object = None
+    created_at: object = None
+    updated_at: object = None
+    is_locked: bool = False
+    full_name: str = "John Doe"
+
+
 @pytest.fixture
 def mock_user():
     """Provide mock user for unit tests."""
-    user = MagicMock(spec=User)
-    user.id = 1
-    user.email = "test@example.com"
-    user.hashed_password = "$2b$12$hash"
-    user.first_name = "John"
-    user.last_name = "Doe"
-    user.bio = "Test bio"
-    user.is_active = True
-    user.is_verified = False
-    user.failed_login_attempts = 0
-    user.locked_until = None
-    user.last_login = None
-    user.is_locked.return_value = False
-    user.full_name = "John Doe"
-    return user
+    return _FakeUser()
+
+
+# Shared test-case tables. Module-level read-only constants: the data
+# never varies per test, so tests may import them directly; the
+# fixtures below are thin wrappers kept for the existing signatures.
+PASSWORD_TEST_CASES = MappingProxyType({
+    "valid_passwords": [
+        "ValidPass123",
+        "StrongP@ss1",
+        "Tr0ub4dor&3",
+        "MySecure123!",
+        "ComplexP@ssw0rd"
+    ],
+    "invalid_passwords": {
+        "too_short": "123",
+        "no_uppercase": "validpass123",
+        "no_lowercase": "VALIDPASS123",
+        "no_numbers": "ValidPassword",
+        "too_long": "a" * 129,
+        "common_pattern": "password123",
+        "sequential": "abc123def",
+        "repetitive": "aaabbbccc"
+    }
+})
 
+LOGIN_TEST_CASES = MappingProxyType({
+    "valid_login": {
+        "email": "test@example.com",
+        "password": "ValidPass123"
+    },
+    "invalid_email": {
+        "email": "invalid-email",
+        "password": "ValidPass123"
+    },
+    "empty_email": {
+        "email": "",
+        "password": "ValidPass123"
+    },
+    "empty_password": {
+        "email": "test@example.com",
+        "password": ""
+    },
+    "wrong_password": {
+        "email": "test@example.com",
+        "password": "WrongPassword123"
+    },
+    "nonexistent_user": {
+        "email": "nonexistent@example.com",
+        "password": "ValidPass123"
+    }
+})
 
-@pytest.fixture
+REGISTRATION_TEST_CASES = MappingProxyType({
+    "valid_registration": {
+        "email": "newuser@example.com",
+        "password": "ValidPass123",
+        "confirm_password": "ValidPass123",
+        "first_name": "Jane",
+        "last_name": "Smith"
+    },
+    "password_mismatch": {
+        "email": "newuser@example.com",
+        "password": "ValidPass123",
+        "confirm_password": "DifferentPass123"
+    },
+    "invalid_email": {
+        "email": "invalid-email",
+        "password": "ValidPass123",
+        "confirm_password": "ValidPass123"
+    },
+    "weak_password": {
+        "email": "newuser@example.com",
+        "password": "weak",
+        "confirm_password": "weak"
+    },
+    "duplicate_email": {
+        "email": "test@example.com",  # Same as sample_user
+        "password": "ValidPass123",
+        "confirm_password": "ValidPass123"
+    }
+})
+
+CHANGE_PASSWORD_TEST_CASES = MappingProxyType({
+    "valid_change": {
+        "current_password": "ValidPass123",
+        "new_password": "NewValidPass456",
+        "confirm_new_password": "NewValidPass456"
+    },
+    "wrong_current": {
+        "current_password": "WrongPassword",
+        "new_password": "NewValidPass456",
+        "confirm_new_password": "NewValidPass456"
+    },
+    "same_password": {
+        "current_password": "ValidPass123",
+        "new_password": "ValidPass123",
+        "confirm_new_password": "ValidPass123"
+    },
+    "password_mismatch": {
+        "current_password": "ValidPass123",
+        "new_password": "NewValidPass456",
+        "confirm_new_password": "DifferentPass789"
+    },
+    "weak_new_password": {
+        "current_password": "ValidPass123",
+        "new_password": "weak",
+        "confirm_new_password": "weak"
+    }
+})
+
+
+@pytest.fixture(scope="session")
 def password_test_cases():
     """Provide various password test cases."""
-    return {
-        "valid_passwords": [
-            "ValidPass123",
-            "StrongP@ss1",
-            "Tr0ub4dor&3",
-            "MySecure123!",
-            "ComplexP@ssw0rd"
-        ],
-        "invalid_passwords": {
-            "too_short": "123",
-            "no_uppercase": "validpass123",
-            "no_lowercase": "VALIDPASS123",
-            "no_numbers": "ValidPassword",
-            "too_long": "a" * 129,
-            "common_pattern": "password123",
-            "sequential": "abc123def",
-            "repetitive": "aaabbbccc"
-        }
-    }
+    return PASSWORD_TEST_CASES
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def login_test_cases():
     """Provide login test scenarios."""
-    return {
-        "valid_login": {
-            "email": "test@example.com",
-            "password": "ValidPass123"
-        },
-        "invalid_email": {
-            "email": "invalid-email",
-            "password": "ValidPass123"
-        },
-        "empty_email": {
-            "email": "",
-            "password": "ValidPass123"
-        },
-        "empty_password": {
-            "email": "test@example.com",
-            "password": ""
-        },
-        "wrong_password": {
-            "email": "test@example.com",
-            "password": "WrongPassword123"
-        },
-        "nonexistent_user": {
-            "email": "nonexistent@example.com",
-            "password": "ValidPass123"
-        }
-    }
+    return LOGIN_TEST_CASES
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def registration_test_cases():
     """Provide registration test scenarios."""
-    return {
-        "valid_registration": {
-            "email": "newuser@example.com",
-            "password": "ValidPass123",
-            "confirm_password": "ValidPass123",
-            "first_name": "Jane",
-            "last_name": "Smith"
-        },
-        "password_mismatch": {
-            "email": "newuser@example.com",
-            "password": "ValidPass123",
-            "confirm_password": "DifferentPass123"
-        },
-        "invalid_email": {
-            "email": "invalid-email",
-            "password": "ValidPass123",
-            "confirm_password": "ValidPass123"
-        },
-        "weak_password": {
-            "email": "newuser@example.com",
-            "password": "weak",
-            "confirm_password": "weak"
-        },
-        "duplicate_email": {
-            "email": "test@example.com",  # Same as sample_user
-            "password": "ValidPass123",
-            "confirm_password": "ValidPass123"
-        }
-    }
+    return REGISTRATION_TEST_CASES
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def change_password_test_cases():
     """Provide change password test scenarios."""
-    return {
-        "valid_change": {
-            "current_password": "ValidPass123",
-            "new_password": "NewValidPass456",
-            "confirm_new_password": "NewValidPass456"
-        },
-        "wrong_current": {
-            "current_password": "WrongPassword",
-            "new_password": "NewValidPass456",
-            "confirm_new_password": "NewValidPass456"
-        },
-        "same_password": {
-            "current_password": "ValidPass123",
-            "new_password": "ValidPass123",
-            "confirm_new_password": "ValidPass123"
-        },
-        "password_mismatch": {
-            "current_password": "ValidPass123",
-            "new_password": "NewValidPass456",
-            "confirm_new_password": "DifferentPass789"
-        },
-        "weak_new_password": {
-            "current_password": "ValidPass123",
-            "new_password": "weak",
-            "confirm_new_password": "weak"
-        }
-    }
+    return CHANGE_PASSWORD_TEST_CASES
+
+
+@lru_cache(maxsize=1)
+def _hash_table():
+    """
+    The handful of passwords the suite reuses, hashed once on first
+    use; helpers and tests look hashes up here instead of re-running
+    the KDF inside each (parametrized) case. Lazy so that a bare
+    collection pass never imports the hashing stack.
+    """
+    from src.utils.password import hash_password
+    
+    return {pw: hash_password(pw) for pw in (
+        "ValidPass123",
+        "NewValidPass456",
+        "NewStrongPass456!",
+        "WrongPassword",
+    )}
+
+
+@pytest.fixture(scope="session")
+def hashed_passwords():
+    """Provide the precomputed password-hash table."""
+    return _hash_table()
 
 
 # Test utilities
@@ -303,11 +496,11 @@ class TestUtils:
     @staticmethod
     def create_test_user(db_session, **kwargs):
         """Create a test user with custom attributes."""
-        from src.auth import hash_password
+        from src.database import User
         
         defaults = {
             "email": "testuser@example.com",
-            "hashed_password": hash_password("ValidPass123"),
+            "hashed_password": _hash_table()["ValidPass123"],
             "first_name": "Test",
             "last_name": "User",
             "is_active": True
@@ -316,8 +509,9 @@ class TestUtils:
         
         user = User(**defaults)
         db_session.add(user)
+        # No refresh: every attribute is fully specified above and
+        # expire_on_commit=False keeps them loaded after the commit.
         db_session.commit()
-        db_session.refresh(user)
         return user
     
     @staticmethod
@@ -353,19 +547,110 @@ def test_utils():
     return TestUtils
 
 
-# Markers for test organization
-pytestmark = [
-    pytest.mark.asyncio,  # Mark all tests as async-compatible
-]
+# Auto-use fixtures for common setup
+@pytest.fixture(scope="session", autouse=True)
+def setup_test_environment():
+    """
+    Set up test environment variables.
+
+    Session-scoped: the values never vary per test, so there is no
+    reason to re-set (and tear down) them around every single test the
+    way the old function-scoped monkeypatch version did. No teardown —
+    the process exits when the session ends.
+    """
+    os.environ.update({
+        "TESTING": "true",
+        "SECRET_KEY": "test-secret-key",
+        "DATABASE_URL": "sqlite:///:memory:",
+    })
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _fast_password_hash():
+    """
+    Optional KDF bypass for local tight-loop runs (FAST_HASH=1).
+
+    Replaces hash_password/verify_password with a symmetric salted-less
+    SHA-256 stub (compared with hmac.compare_digest to keep the
+    constant-time contract). Off by default: the normal run keeps real
+    bcrypt at cost 4 so integration tests exercise the genuine KDF
+    path; this exists for edit-run loops where even cost 4 adds up.
+    The rebinding is by identity across every loaded module, so test
+    files that did `from src.auth import hash_password` at import time
+    are redirected too — a stub hash is never checked with real bcrypt
+    or vice versa.
+    """
+    if os.environ.get("FAST_HASH") != "1":
+        yield
+        return
+
+    import hashlib
+    import hmac
+    import secrets
+    import sys
+
+    from src.utils import password as password_module
+
+    # Salted so repeated hashes of one password still differ, matching
+    # the bcrypt property the hashing unit tests assert.
+    def _digest(salt: str, password: str) -> str:
+        return hashlib.sha256((salt + password).encode()).hexdigest()
+
+    def _fast_hash(password: str) -> str:
+        salt = secrets.token_hex(16)
+        return f"sha256${salt}${_digest(salt, password)}"
+
+    def _fast_verify(plain_password: str, hashed_password: str) -> bool:
+        try:
+            _, salt, digest = hashed_password.split("$")
+            return hmac.compare_digest(_digest(salt, plain_password), digest)
+        except (AttributeError, TypeError, ValueError):
+            return False
+
+    replacements = {
+        password_module.hash_password: ("hash_password", _fast_hash),
+        password_module.verify_password: ("verify_password", _fast_verify),
+    }
+    mp = pytest.MonkeyPatch()
+    for module in list(sys.modules.values()):
+        for original, (attr, stub) in replacements.items():
+            if getattr(module, attr, None) is original:
+                mp.setattr(module, attr, stub)
+    yield
+    mp.undo()
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _warm_bcrypt(_fast_password_hash):
+    """
+    Pay bcrypt's one-time backend binding cost up front.
+
+    The first hash of a session triggers CFFI initialization (and, via
+    _hash_table, fills the precomputed hash cache); doing it here pins
+    that fixed cost to session start instead of whichever test happens
+    to hash first.
+    """
+    _hash_table()
 
 
-# Auto-use fixtures for common setup
 @pytest.fixture(autouse=True)
-def setup_test_environment(monkeypatch):
-    """Set up test environment variables."""
-    monkeypatch.setenv("TESTING", "true")
-    monkeypatch.setenv("SECRET_KEY", "test-secret-key")
-    monkeypatch.setenv("DATABASE_URL", "sqlite:///:memory:")
+def _reset_auth_caches():
+    """
+    Clear the auth module's process-level caches between tests.
+    
+    Database state rolls back with the outer transaction, but the user
+    snapshot and verified-token caches would otherwise carry entries
+    from rows that no longer exist.
+    """
+    from src import auth as auth_module
+    
+    yield
+    auth_module._user_cache.clear()
+    auth_module._verified_token_cache.clear()
+    auth_module._payload_cache.clear()
+    # The signed token pair is reused across tests, so a test that
+    # revokes it must not poison the rest of the session.
+    auth_module._revoked_token_cache.clear()
 
 
 # Custom pytest hooks
@@ -385,17 +670,24 @@ def pytest_configure(config):
     )
 
 
+# Token -> marker maps for pytest_collection_modifyitems; the compiled
+# alternations let one scan per item replace four substring checks.
+_NODEID_MARKERS = {
+    "test_auth": pytest.mark.auth,
+    "test_password": pytest.mark.password,
+    "integration": pytest.mark.integration,
+}
+_NODEID_MARKER_RE = re.compile("|".join(_NODEID_MARKERS))
+_SLOW_NAME_RE = re.compile("slow|performance")
+
+
 def pytest_collection_modifyitems(config, items):
     """Modify test collection to add markers based on test names."""
     for item in items:
         # Add markers based on test file names
-        if "test_auth" in item.nodeid:
-            item.add_marker(pytest.mark.auth)
-        if "test_password" in item.nodeid:
-            item.add_marker(pytest.mark.password)
-        if "integration" in item.nodeid:
-            item.add_marker(pytest.mark.integration)
-        
+        for match in _NODEID_MARKER_RE.finditer(item.nodeid):
+            item.add_marker(_NODEID_MARKERS[match.group()])
+
         # Mark slow tests
-        if "slow" in item.name or "performance" in item.name:
+        if _SLOW_NAME_RE.search(item.name):
             item.add_marker(pytest.mark.slow)
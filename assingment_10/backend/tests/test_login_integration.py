@@ -164,7 +164,7 @@ class TestLoginFeatureIntegration:
         # Verify account is locked
         db_session.refresh(created_user)
         assert created_user.locked_until is not None
-        assert created_user.is_locked() is True
+        assert created_user.is_locked is True
     
     def test_login_locked_account_with_correct_password(self, client, db_session, sample_user_data):
         """Test login attempt on locked account even with correct password."""